@@ -0,0 +1,182 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import os
+import time
+
+import metrics
+
+# (max concurrent calls, max queued calls, max seconds a call may wait in the queue)
+# per expensive tool. Tools not listed here are never queued, so cheap lookups
+# like get_video_info stay fast while heavy jobs wait their turn.
+DEFAULT_TOOL_LIMITS: Dict[str, Tuple[int, int, float]] = {
+    "get_video_comments_tool": (4, 32, 30.0),
+    "summarize_video": (4, 32, 30.0),
+    "generate_video_quiz": (4, 32, 30.0),
+    "generate_video_flashcards": (4, 32, 30.0),
+    "crawl_related_videos": (2, 8, 60.0),
+    "generate_playlist_study_decks": (1, 4, 60.0),
+    "find_duplicate_videos": (1, 4, 60.0),
+}
+
+# Weight of the latest call in the moving average of call durations
+DURATION_SMOOTHING = 0.2
+
+
+class ServerBusy(Exception):
+    """Raised when a call is shed because its tool is saturated."""
+
+    def __init__(self, tool: str, retry_after: float) -> None:
+        super().__init__(f"{tool} is busy, retry after {retry_after:.0f} seconds")
+        self.tool = tool
+        self.retry_after = retry_after
+
+
+class ToolGate:
+    """Concurrency limit for one tool with a bounded priority queue.
+
+    Calls beyond max_concurrent wait in the queue, lowest priority value
+    first and FIFO among equals. A call is shed with ServerBusy when the
+    queue is full or when it has waited longer than max_wait.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, max_wait: float) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.mean_duration = 1.0
+        self._waiters: List[Tuple[float, int, asyncio.Future]] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def retry_after(self) -> float:
+        """Estimate how long until a new call could be admitted."""
+        rounds = (self._queued + self.max_concurrent) / self.max_concurrent
+        return max(1.0, rounds * self.mean_duration)
+
+    def record_duration(self, seconds: float) -> None:
+        self.mean_duration += DURATION_SMOOTHING * (seconds - self.mean_duration)
+
+    async def acquire(self, priority: float = 0.0) -> None:
+        """Wait for a slot, raising ServerBusy if the call has to be shed."""
+        if self.active < self.max_concurrent and not self._queued:
+            self.active += 1
+            return
+        if self._queued >= self.max_queue:
+            metrics.incr("admission_shed", tool=self.name, reason="queue_full")
+            raise ServerBusy(self.name, self.retry_after())
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._queued += 1
+        expiry = loop.call_later(self.max_wait, self._expire, future)
+        try:
+            with metrics.timer("queue_wait", tool=self.name):
+                await future
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            if future.cancelled():
+                self._queued -= 1
+            elif future.exception() is None:
+                # The slot was handed over just as the caller went away
+                self.release()
+            raise
+        finally:
+            expiry.cancel()
+
+    def _expire(self, future: asyncio.Future) -> None:
+        if not future.done():
+            self._queued -= 1
+            metrics.incr("admission_shed", tool=self.name, reason="deadline")
+            future.set_exception(ServerBusy(self.name, self.retry_after()))
+
+    def release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._queued -= 1
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+def _parse_limits(spec: str) -> Dict[str, Tuple[int, int, float]]:
+    """Parse "tool=concurrent:queue:wait,..." as used by YT_MCP_TOOL_LIMITS."""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        tool, _, values = entry.partition("=")
+        concurrent, queue, wait = values.split(":")
+        limits[tool.strip()] = (int(concurrent), int(queue), float(wait))
+    return limits
+
+
+TOOL_LIMITS = {**DEFAULT_TOOL_LIMITS, **_parse_limits(os.environ.get("YT_MCP_TOOL_LIMITS", ""))}
+
+_gates: Dict[str, ToolGate] = {}
+
+
+def get_gate(tool: str) -> Optional[ToolGate]:
+    """Get the admission gate of a tool, or None if the tool is not limited."""
+    if tool not in TOOL_LIMITS:
+        return None
+    if tool not in _gates:
+        _gates[tool] = ToolGate(tool, *TOOL_LIMITS[tool])
+    return _gates[tool]
+
+
+def gates() -> List[ToolGate]:
+    """Get all gates that have been used so far."""
+    return list(_gates.values())
+
+
+def admit(priority: Optional[Callable[[Dict[str, Any]], float]] = None) -> Callable:
+    """Limit an async MCP tool according to TOOL_LIMITS.
+
+    Shed calls return a "busy, retry after" message instead of running.
+
+    Args:
+        priority: Maps the call's arguments to a priority, lower runs first
+    """
+    def decorator(fn: Callable) -> Callable:
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            gate = get_gate(fn.__name__)
+            if gate is None:
+                return await fn(*args, **kwargs)
+
+            call_priority = 0.0
+            if priority is not None:
+                arguments = signature.bind_partial(*args, **kwargs)
+                arguments.apply_defaults()
+                call_priority = priority(arguments.arguments)
+
+            try:
+                await gate.acquire(call_priority)
+            except ServerBusy as e:
+                return (
+                    f"Server busy: {e.tool} is at capacity ({gate.active} running, {gate.queued} queued). "
+                    f"Retry after {e.retry_after:.0f} seconds."
+                )
+
+            start = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                gate.record_duration(time.perf_counter() - start)
+                gate.release()
+        return wrapper
+    return decorator
@@ -0,0 +1,110 @@
+"""Measure MCP server cold start.
+
+Reports the time to import ``mcp_videos`` in a fresh interpreter, which of
+the heavy client libraries that import pulled in, and the wall-clock time
+from spawning the stdio server to its first ``list_tools`` response.
+
+Usage:
+    python bench_startup.py [--runs 5] [--importtime]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that should only be loaded on first use
+HEAVY_MODULES = ("googleapiclient", "google_auth_oauthlib", "youtube_transcript_api", "youtube_search")
+
+IMPORT_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import mcp_videos
+elapsed = time.perf_counter() - start
+loaded = ",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules)
+print(elapsed, loaded)
+"""
+
+
+def measure_import(runs: int) -> tuple[list[float], str]:
+    """Time ``import mcp_videos`` in fresh interpreters."""
+    timings = []
+    loaded = ""
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE], cwd=HERE, capture_output=True, text=True, check=True
+        )
+        elapsed, _, loaded = result.stdout.strip().partition(" ")
+        timings.append(float(elapsed))
+    return timings, loaded
+
+
+async def time_to_list_tools() -> tuple[float, int]:
+    """Spawn the stdio server and time it until the first list_tools response."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable, args=[os.path.join(HERE, "mcp_videos.py")], cwd=HERE
+    )
+    start = time.perf_counter()
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            result = await session.list_tools()
+            elapsed = time.perf_counter() - start
+    return elapsed, len(result.tools)
+
+
+def print_importtime(limit: int = 15) -> None:
+    """Print the modules with the largest cumulative import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mcp_videos"],
+        cwd=HERE, capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), name.strip()))
+
+    print("\nSlowest imports (cumulative):")
+    for cumulative, name in sorted(rows, reverse=True)[:limit]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+
+def summarize(label: str, timings: list[float]) -> None:
+    print(
+        f"{label}: median {statistics.median(timings) * 1000:.1f} ms, "
+        f"min {min(timings) * 1000:.1f} ms, max {max(timings) * 1000:.1f} ms ({len(timings)} runs)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure")
+    parser.add_argument("--importtime", action="store_true", help="Also show the slowest imports")
+    args = parser.parse_args()
+
+    timings, loaded = measure_import(args.runs)
+    summarize("import mcp_videos", timings)
+    print(f"Heavy modules loaded at import: {loaded or 'none'}")
+
+    list_tools_timings = []
+    tool_count = 0
+    for _ in range(args.runs):
+        elapsed, tool_count = asyncio.run(time_to_list_tools())
+        list_tools_timings.append(elapsed)
+    summarize(f"spawn to first list_tools ({tool_count} tools)", list_tools_timings)
+
+    if args.importtime:
+        print_importtime()
+
+
+if __name__ == "__main__":
+    main()
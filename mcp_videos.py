@@ -1,10 +1,28 @@
 from typing import Any, List, Dict, Tuple, Optional
+import argparse
+import asyncio
+import multiprocessing
+import os
 import random
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+
+import metrics
+from admission import admit, gates
+from metrics import instrument_tool
+from near_duplicates import (
+    TranscriptSignature,
+    build_signature,
+    cache_signature,
+    find_near_duplicates,
+    get_cached_signature,
+)
+from related_graph import crawl as crawl_related, get_graph
+from transcript_summary import format_timestamp, summarize_transcript
 from yt_helper import construct_video_url, search_youtube
 from youtube_api import (
     get_video_details,
@@ -13,11 +31,33 @@ from youtube_api import (
     get_trending_videos,
     get_related_videos,
     get_video_transcript,
+    get_playlist_video_ids,
 )
 
 # Initialize FastMCP server
 mcp = FastMCP("videos")
 
+# Opt-in sampling profiler, see metrics.PROFILE_INTERVAL_ENV. Pool workers
+# import this module too and are not profiled.
+if multiprocessing.parent_process() is None:
+    metrics.start_profiler_from_env()
+
+# Maximum number of videos whose metadata/transcripts are fetched at once by batch tools
+BATCH_FETCH_CONCURRENCY = 8
+
+# Worker processes for CPU-bound batch work (cards, quizzes, MinHash), created on first use
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool used for CPU-bound batch work."""
+    global _process_pool
+    if _process_pool is None:
+        # Forking a process that already runs threads can deadlock the child,
+        # so workers come from a fork server instead
+        _process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("forkserver"))
+    return _process_pool
+
 
 def format_video(video: dict[str, Any]) -> str:
     """Format a video feature into a readable string."""
@@ -57,6 +97,7 @@ def format_comment(comment: dict[str, Any]) -> str:
 
 
 @mcp.tool()
+@instrument_tool
 async def get_videos(search: str, max_results: int) -> str:
     """Get videos for a search query.
 
@@ -64,7 +105,7 @@ async def get_videos(search: str, max_results: int) -> str:
         search: Search query string
         max_results: Maximum number of results to return
     """
-    results = search_youtube(search, max_results=max_results)
+    results = await asyncio.to_thread(search_youtube, search, max_results=max_results)
     if not results:
         return "No videos found."
 
@@ -73,32 +114,36 @@ async def get_videos(search: str, max_results: int) -> str:
 
 
 @mcp.tool()
+@instrument_tool
 async def get_video_info(video_id: str) -> str:
     """Get detailed information about a video.
 
     Args:
         video_id: YouTube video ID
     """
-    video = get_video_details(video_id)
+    video = await asyncio.to_thread(get_video_details, video_id)
     if not video:
         return "No video found."
     return format_video(video)
 
 
 @mcp.tool()
+@instrument_tool
 async def get_channel_details(channel_id: str) -> str:
     """Get detailed information about a YouTube channel.
 
     Args:
         channel_id: YouTube channel ID
     """
-    channel = get_channel_info(channel_id)
+    channel = await asyncio.to_thread(get_channel_info, channel_id)
     if not channel:
         return "No channel found."
     return format_channel(channel)
 
 
 @mcp.tool()
+@instrument_tool
+@admit(priority=lambda args: args['max_results'])
 async def get_video_comments_tool(video_id: str, max_results: int = 100) -> str:
     """Get comments for a video.
 
@@ -106,7 +151,7 @@ async def get_video_comments_tool(video_id: str, max_results: int = 100) -> str:
         video_id: YouTube video ID
         max_results: Maximum number of comments to return (default: 100)
     """
-    comments = get_video_comments(video_id, max_results=max_results)
+    comments = await asyncio.to_thread(get_video_comments, video_id, max_results=max_results)
     if not comments:
         return "No comments found or comments are disabled."
     
@@ -115,6 +160,7 @@ async def get_video_comments_tool(video_id: str, max_results: int = 100) -> str:
 
 
 @mcp.tool()
+@instrument_tool
 async def get_trending_videos_tool(region_code: str = "US", max_results: int = 50) -> str:
     """Get trending videos for a region.
 
@@ -122,7 +168,7 @@ async def get_trending_videos_tool(region_code: str = "US", max_results: int = 5
         region_code: Two-letter ISO country code (default: "US")
         max_results: Maximum number of videos to return (default: 50)
     """
-    videos = get_trending_videos(region_code, max_results=max_results)
+    videos = await asyncio.to_thread(get_trending_videos, region_code, max_results=max_results)
     if not videos:
         return "No trending videos found."
     
@@ -131,6 +177,7 @@ async def get_trending_videos_tool(region_code: str = "US", max_results: int = 5
 
 
 @mcp.tool()
+@instrument_tool
 async def get_related_videos_tool(video_id: str, max_results: int = 25) -> str:
     """Get videos related to a specific video.
 
@@ -138,7 +185,7 @@ async def get_related_videos_tool(video_id: str, max_results: int = 25) -> str:
         video_id: YouTube video ID
         max_results: Maximum number of videos to return (default: 25)
     """
-    videos = get_related_videos(video_id, max_results=max_results)
+    videos = await asyncio.to_thread(get_related_videos, video_id, max_results=max_results)
     if not videos:
         return "No related videos found."
     
@@ -147,25 +194,87 @@ async def get_related_videos_tool(video_id: str, max_results: int = 25) -> str:
 
 
 @mcp.tool()
-async def summarize_video(video_id: str, include_comments: bool = True) -> str:
+@instrument_tool
+@admit(priority=lambda args: args['breadth'] ** args['depth'])
+async def crawl_related_videos(
+    video_id: str,
+    depth: int = 2,
+    breadth: int = 5,
+    top_n: int = 20,
+    max_fetches: int = 50
+) -> str:
+    """Explore the neighborhood of a video and rank it by centrality.
+    
+    Related videos are crawled breadth-first and stored locally, so edges seen
+    by earlier crawls are never fetched again. Results are ranked by PageRank
+    over the whole stored graph.
+    
+    Args:
+        video_id: YouTube video ID to start from
+        depth: Number of hops to follow (default: 2)
+        breadth: Number of related videos followed per video, at most 25 (default: 5)
+        top_n: Number of top-ranked videos to return (default: 20)
+        max_fetches: Maximum number of API fetches, 100 quota units each (default: 50)
+    """
+    graph = get_graph()
+    visited, fetches = await crawl_related(
+        graph, video_id, depth=depth, breadth=min(breadth, 25), max_fetches=max_fetches
+    )
+    if len(visited) == 1:
+        return "No related videos found."
+    
+    # Centrality is computed over everything stored, not just this crawl
+    rank = await asyncio.to_thread(graph.pagerank)
+    in_degrees = graph.in_degrees()
+    ranked = sorted(visited, key=lambda node: rank.get(node, 0.0), reverse=True)[:top_n]
+    
+    output = [
+        "=== Related Video Crawl ===",
+        f"Start: {construct_video_url(video_id)}",
+        f"Videos reached: {len(visited)}",
+        f"API fetches: {fetches} ({fetches * 100} quota units)",
+        f"Stored graph: {len(graph.adjacency)} expanded videos, {graph.edge_count()} edges",
+        "\n=== Most Central Videos ===",
+    ]
+    for position, node in enumerate(ranked, 1):
+        info = graph.nodes.get(node, {})
+        output.append(f"\n{position}. {info.get('title', 'Unknown')}")
+        output.append(f"Channel: {info.get('channel_title', 'Unknown')}")
+        output.append(f"URL: {construct_video_url(node)}")
+        output.append(f"Centrality: {rank.get(node, 0.0):.6f} (linked from {in_degrees.get(node, 0)} videos)")
+    
+    return "\n".join(output)
+
+
+@mcp.tool()
+@instrument_tool
+@admit(priority=lambda args: args['include_comments'])
+async def summarize_video(
+    video_id: str,
+    include_comments: bool = True,
+    summary_sentences: int = 5,
+    summary_max_chars: Optional[int] = None
+) -> str:
     """Get a comprehensive summary of a YouTube video.
     
     Args:
         video_id: YouTube video ID
         include_comments: Whether to include top comments in the summary (default: True)
+        summary_sentences: Number of timestamped key sentences in the transcript summary (default: 5)
+        summary_max_chars: Maximum total length of the key sentences (default: no limit)
     """
     # Get video details
-    video = get_video_details(video_id)
+    video = await asyncio.to_thread(get_video_details, video_id)
     if not video:
         return "No video found."
     
     # Get transcript
-    transcript = get_video_transcript(video_id)
+    transcript = await asyncio.to_thread(get_video_transcript, video_id)
     
     # Get comments if requested
     comments = []
     if include_comments:
-        comments = get_video_comments(video_id, max_results=5)
+        comments = await asyncio.to_thread(get_video_comments, video_id, max_results=5)
     
     # Build the summary
     summary = []
@@ -188,11 +297,19 @@ async def summarize_video(video_id: str, include_comments: bool = True) -> str:
     # Add transcript summary if available
     if transcript:
         summary.append("\n=== Transcript Summary ===")
-        # Combine transcript segments into a single text
-        full_transcript = " ".join(segment['text'] for segment in transcript)
-        # Take first 500 characters as a preview
-        transcript_preview = full_transcript[:500] + "..." if len(full_transcript) > 500 else full_transcript
-        summary.append(transcript_preview)
+        # Pick the most representative sentences, ranked once per video and cached.
+        # Ranking a long transcript takes a while, so it runs off the event loop.
+        key_sentences = await asyncio.to_thread(
+            summarize_transcript,
+            transcript,
+            max_sentences=summary_sentences,
+            max_chars=summary_max_chars,
+            cache_key=video_id
+        )
+        for sentence in key_sentences:
+            summary.append(f"[{format_timestamp(sentence.start)}] {sentence.text}")
+        if not key_sentences:
+            summary.append("No transcript summary available within the requested length.")
     else:
         summary.append("\n=== Transcript ===")
         summary.append("No transcript available for this video.")
@@ -353,6 +470,8 @@ def format_quiz(questions: List[Dict[str, Any]]) -> str:
     return "\n".join(quiz_text)
 
 @mcp.tool()
+@instrument_tool
+@admit()
 async def generate_video_quiz(video_id: str) -> str:
     """Generate a quiz based on the video content.
     
@@ -363,12 +482,12 @@ async def generate_video_quiz(video_id: str) -> str:
         A formatted quiz with 10 questions of various types
     """
     # Get video details
-    video = get_video_details(video_id)
+    video = await asyncio.to_thread(get_video_details, video_id)
     if not video:
         return "No video found."
     
     # Get transcript
-    transcript = get_video_transcript(video_id)
+    transcript = await asyncio.to_thread(get_video_transcript, video_id)
     
     # Generate questions
     questions = generate_quiz_questions(video, transcript)
@@ -480,7 +599,26 @@ def format_flashcards(cards: List[FlashCard]) -> str:
     
     return "\n".join(output)
 
+def format_card_statistics(cards: List[FlashCard]) -> str:
+    """Format per-category and per-difficulty card counts."""
+    categories_count = {}
+    difficulties_count = {}
+    for card in cards:
+        categories_count[card.category] = categories_count.get(card.category, 0) + 1
+        difficulties_count[card.difficulty] = difficulties_count.get(card.difficulty, 0) + 1
+    
+    stats = "\n=== Card Statistics ===\n"
+    stats += "Categories:\n"
+    for category, count in categories_count.items():
+        stats += f"- {category}: {count} cards\n"
+    stats += "\nDifficulties:\n"
+    for diff, count in difficulties_count.items():
+        stats += f"- {diff}: {count} cards\n"
+    return stats
+
 @mcp.tool()
+@instrument_tool
+@admit(priority=lambda args: args['max_cards'])
 async def generate_video_flashcards(
     video_id: str,
     max_cards: int = 10,
@@ -499,12 +637,12 @@ async def generate_video_flashcards(
         Formatted string containing flash cards
     """
     # Get video details
-    video = get_video_details(video_id)
+    video = await asyncio.to_thread(get_video_details, video_id)
     if not video:
         return "No video found."
     
     # Get transcript
-    transcript = get_video_transcript(video_id)
+    transcript = await asyncio.to_thread(get_video_transcript, video_id)
     if not transcript:
         return "No transcript available for this video. Cannot generate flash cards."
     
@@ -530,25 +668,311 @@ Total Cards: {len(cards)}
 """
     
     # Add card statistics
-    categories_count = {}
-    difficulties_count = {}
-    for card in cards:
-        categories_count[card.category] = categories_count.get(card.category, 0) + 1
-        difficulties_count[card.difficulty] = difficulties_count.get(card.difficulty, 0) + 1
-    
-    stats = "\n=== Card Statistics ===\n"
-    stats += "Categories:\n"
-    for category, count in categories_count.items():
-        stats += f"- {category}: {count} cards\n"
-    stats += "\nDifficulties:\n"
-    for diff, count in difficulties_count.items():
-        stats += f"- {diff}: {count} cards\n"
+    stats = format_card_statistics(cards)
     
     # Format the cards
     cards_text = format_flashcards(cards)
     
     return header + stats + cards_text
 
+def build_study_deck(
+    video: dict[str, Any],
+    transcript: List[Dict[str, Any]],
+    max_cards: int,
+    include_quiz: bool
+) -> str:
+    """Build the formatted flash card deck (and optional quiz) for one video.
+    
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    cards = extract_key_points(transcript, max_cards=max_cards)
+    
+    deck = [
+        f"=== {video['title']} ===",
+        f"Channel: {video['channel_title']}",
+        f"URL: {construct_video_url(video['id'])}",
+        f"Total Cards: {len(cards)}",
+        format_card_statistics(cards),
+        format_flashcards(cards),
+    ]
+    
+    if include_quiz:
+        questions = generate_quiz_questions(video, transcript)
+        deck.append("\n=== Quiz ===")
+        deck.append(format_quiz(questions))
+    
+    return "\n".join(deck)
+
+async def fetch_video_content(
+    video_id: str,
+    semaphore: asyncio.Semaphore
+) -> Tuple[Optional[dict[str, Any]], Optional[List[dict[str, Any]]]]:
+    """Fetch video details and transcript concurrently without blocking the event loop."""
+    async with semaphore:
+        video, transcript = await asyncio.gather(
+            asyncio.to_thread(get_video_details, video_id),
+            asyncio.to_thread(get_video_transcript, video_id),
+        )
+    return video, transcript
+
+@mcp.tool()
+@instrument_tool
+@admit(priority=lambda args: args['max_videos'])
+async def generate_playlist_study_decks(
+    playlist_id: str,
+    ctx: Context,
+    max_videos: int = 100,
+    max_cards: int = 10,
+    include_quiz: bool = True
+) -> str:
+    """Generate flash cards and quizzes for every video in a playlist.
+    
+    Each video's deck is streamed back as a log message as soon as it is
+    ready; the complete set is returned in playlist order at the end.
+    
+    Args:
+        playlist_id: YouTube playlist ID
+        max_videos: Maximum number of playlist videos to process (default: 100)
+        max_cards: Maximum number of cards per video (default: 10)
+        include_quiz: Whether to include a quiz for each video (default: True)
+        
+    Returns:
+        Formatted string containing one deck per video
+    """
+    video_ids = await asyncio.to_thread(get_playlist_video_ids, playlist_id, max_videos)
+    if not video_ids:
+        return "No videos found in playlist."
+    
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+    
+    async def build(video_id: str) -> Tuple[str, str]:
+        try:
+            video, transcript = await fetch_video_content(video_id, semaphore)
+            if not video:
+                return video_id, f"=== {video_id} ===\nNo video found."
+            if not transcript:
+                return video_id, f"=== {video['title']} ===\nNo transcript available for this video."
+            
+            # Card and quiz generation is CPU-bound, keep it off the event loop
+            deck = await loop.run_in_executor(
+                get_process_pool(), build_study_deck, video, transcript, max_cards, include_quiz
+            )
+            return video_id, deck
+        except Exception as e:
+            return video_id, f"=== {video_id} ===\nFailed to generate deck: {e}"
+    
+    decks = {}
+    tasks = [asyncio.create_task(build(video_id)) for video_id in video_ids]
+    for done, next_deck in enumerate(asyncio.as_completed(tasks), 1):
+        video_id, deck = await next_deck
+        decks[video_id] = deck
+        await ctx.info(deck)
+        await ctx.report_progress(done, len(tasks))
+    
+    header = f"""
+=== Playlist Study Decks ===
+Playlist: {playlist_id}
+Videos: {len(video_ids)}
+
+"""
+    return header + "\n\n".join(decks[video_id] for video_id in video_ids)
+
+@mcp.tool()
+@instrument_tool
+@admit(priority=lambda args: len(args['video_ids']))
+async def find_duplicate_videos(video_ids: List[str], threshold: float = 0.5) -> str:
+    """Find re-uploads and near-copies among a set of videos by comparing transcripts.
+    
+    Transcripts are reduced to MinHash signatures of word shingles (cached per
+    video). Small sets are compared pair by pair; for larger ones LSH banding
+    tuned to the threshold picks the candidate pairs.
+    
+    Args:
+        video_ids: YouTube video IDs to compare
+        threshold: Minimum transcript similarity (Jaccard, 0-1) to report (default: 0.5)
+        
+    Returns:
+        Near-duplicate pairs with their similarity and matching time ranges
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(BATCH_FETCH_CONCURRENCY)
+    
+    async def signature_for(video_id: str) -> Optional[TranscriptSignature]:
+        async with semaphore:
+            transcript = await asyncio.to_thread(get_video_transcript, video_id)
+        if not transcript:
+            return None
+        signature = get_cached_signature(video_id, transcript)
+        if signature is None:
+            # MinHash is CPU-bound, keep it off the event loop
+            signature = await loop.run_in_executor(get_process_pool(), build_signature, video_id, transcript)
+            cache_signature(signature)
+        return signature
+    
+    results = await asyncio.gather(*(signature_for(video_id) for video_id in video_ids))
+    signatures = [signature for signature in results if signature is not None]
+    skipped = [video_id for video_id, signature in zip(video_ids, results) if signature is None]
+    
+    pairs = find_near_duplicates(signatures, threshold=threshold)
+    
+    output = [
+        "=== Near-Duplicate Videos ===",
+        f"Videos compared: {len(signatures)}",
+        f"Pairs found: {len(pairs)}",
+    ]
+    if skipped:
+        output.append(f"Skipped (no transcript): {', '.join(skipped)}")
+    
+    for pair in pairs:
+        output.append(f"\n{construct_video_url(pair.first)}")
+        output.append(f"{construct_video_url(pair.second)}")
+        output.append(f"Similarity: {pair.jaccard:.2f} (MinHash estimate {pair.estimated_similarity:.2f})")
+        for first_start, first_end, second_start, second_end in pair.matching_ranges:
+            output.append(
+                f"- {format_timestamp(first_start)}-{format_timestamp(first_end)} matches "
+                f"{format_timestamp(second_start)}-{format_timestamp(second_end)}"
+            )
+    
+    if not pairs:
+        output.append("\nNo near-duplicates found.")
+    return "\n".join(output)
+
+def format_latencies(latencies: dict, metric: str, label: str) -> List[str]:
+    """Format latency summaries of one metric, slowest total time first."""
+    rows = [
+        (dict(labels).get(label, "unknown"), stats)
+        for (name, labels), stats in latencies.items()
+        if name == metric
+    ]
+    rows.sort(key=lambda row: row[1]['total'], reverse=True)
+    return [
+        f"- {key}: {stats['count']} calls, mean {stats['mean'] * 1000:.1f} ms, max {stats['max'] * 1000:.1f} ms"
+        for key, stats in rows
+    ]
+
+@mcp.tool()
+async def server_stats(profile_top: int = 10) -> str:
+    """Get server performance statistics.
+    
+    Shows per-tool and per-upstream-call latency, cache hits, retries,
+    quota spent and, when the sampling profiler is enabled, the hottest frames.
+    
+    Args:
+        profile_top: Number of hottest profiler frames to include (default: 10)
+    """
+    stats = metrics.snapshot()
+    output = ["=== Tool Latency ==="]
+    output.extend(format_latencies(stats['latencies'], "tool", "tool") or ["No tool calls yet."])
+    
+    output.append("\n=== Upstream Latency ===")
+    output.extend(format_latencies(stats['latencies'], "upstream", "call") or ["No upstream calls yet."])
+    
+    phases = format_latencies(stats['latencies'], "phase", "phase")
+    if phases:
+        output.append("\n=== Processing Phases ===")
+        output.extend(phases)
+    
+    output.append("\n=== Counters ===")
+    counters = sorted(stats['counters'].items())
+    for (name, labels), value in counters:
+        label_text = ", ".join(f"{key}={val}" for key, val in labels)
+        output.append(f"- {name}" + (f" ({label_text})" if label_text else "") + f": {value:g}")
+    if not counters:
+        output.append("No counters recorded yet.")
+    
+    tool_gates = gates()
+    if tool_gates:
+        output.append("\n=== Admission Control ===")
+        for gate in tool_gates:
+            output.append(
+                f"- {gate.name}: {gate.active}/{gate.max_concurrent} running, "
+                f"{gate.queued}/{gate.max_queue} queued, mean {gate.mean_duration:.1f} s per call"
+            )
+    
+    profiler = metrics.get_profiler()
+    if profiler.samples:
+        output.append(f"\n=== Hot Frames ({profiler.samples} samples) ===")
+        for frame, count in profiler.report(profile_top):
+            output.append(f"- {frame}: {count}")
+    
+    return "\n".join(output)
+
+def shutdown_process_pool() -> None:
+    """Stop the batch worker processes, if any were started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+def run_network_server(
+    transport: str,
+    host: str,
+    port: int,
+    max_connections: Optional[int],
+    graceful_timeout: int
+) -> None:
+    """Serve many MCP clients from one process over SSE or streamable HTTP.
+    
+    All clients share the process-wide credentials, per-thread API services and
+    caches. Connections beyond max_connections are refused with 503, and on
+    SIGINT/SIGTERM open requests get graceful_timeout seconds to finish.
+    """
+    import uvicorn
+    from starlette.responses import PlainTextResponse
+
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+
+    async def metrics_endpoint(request):
+        return PlainTextResponse(metrics.render_prometheus())
+
+    app.add_route("/metrics", metrics_endpoint)
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        limit_concurrency=max_connections,
+        timeout_graceful_shutdown=graceful_timeout,
+        log_level=mcp.settings.log_level.lower(),
+    )
+    try:
+        uvicorn.Server(config).run()
+    finally:
+        shutdown_process_pool()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="YouTube MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse", "streamable-http"],
+        default=os.environ.get("YT_MCP_TRANSPORT", "stdio"),
+        help="stdio for one client per process, sse or streamable-http to share one server"
+    )
+    parser.add_argument("--host", default=mcp.settings.host, help="Bind address for network transports")
+    parser.add_argument("--port", type=int, default=mcp.settings.port, help="Port for network transports")
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=int(os.environ.get("YT_MCP_MAX_CONNECTIONS", "100")),
+        help="Maximum concurrent connections before new ones get 503 (default: 100)"
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=int(os.environ.get("YT_MCP_GRACEFUL_TIMEOUT", "30")),
+        help="Seconds open requests get to finish on shutdown (default: 30)"
+    )
+    args = parser.parse_args()
+
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+    else:
+        run_network_server(
+            args.transport, args.host, args.port, args.max_connections, args.graceful_timeout
+        )
+
 if __name__ == "__main__":
     # Initialize and run the server
-    mcp.run(transport="stdio")
+    main()
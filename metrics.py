@@ -0,0 +1,242 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+
+# Prefix for every exported metric name
+NAMESPACE = "ytmcp"
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Set to a sampling interval in seconds (e.g. 0.005) to enable the sampling profiler
+PROFILE_INTERVAL_ENV = "YT_MCP_PROFILE_INTERVAL"
+
+# Deepest stack kept per profiler sample
+PROFILE_MAX_DEPTH = 30
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Labels], float] = {}
+_histograms: Dict[Tuple[str, Labels], "_Histogram"] = {}
+
+
+class _Histogram:
+    """Cumulative latency histogram for a single metric/label combination."""
+
+    def __init__(self) -> None:
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def incr(name: str, value: float = 1, **labels: Any) -> None:
+    """Add to a counter, e.g. ``incr("cache_hits", cache="search")``."""
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    """Record a duration in a latency histogram."""
+    key = (name, _labels(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def timer(name: str, **labels: Any):
+    """Time the enclosed block as a span; failures are also counted in ``<name>_errors``."""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        incr(f"{name}_errors", **labels)
+        raise
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Record latency and errors of an async MCP tool under its function name."""
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timer("tool", tool=fn.__name__):
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{_escape(value)}"' for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+def render_prometheus() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(
+            (key, (list(h.buckets), h.count, h.sum)) for key, h in _histograms.items()
+        )
+
+    lines = []
+    declared = set()
+    for (name, labels), value in counters:
+        metric = f"{NAMESPACE}_{name}_total"
+        if metric not in declared:
+            lines.append(f"# TYPE {metric} counter")
+            declared.add(metric)
+        lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+    for (name, labels), (buckets, count, total) in histograms:
+        metric = f"{NAMESPACE}_{name}_duration_seconds"
+        if metric not in declared:
+            lines.append(f"# TYPE {metric} histogram")
+            declared.add(metric)
+        for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+            lines.append(f"{metric}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {bucket_count}")
+        lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}")
+        lines.append(f"{metric}_sum{_format_labels(labels)} {total:.6f}")
+        lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> Dict[str, Any]:
+    """Get a plain-dict copy of all counters and latency summaries."""
+    with _lock:
+        counters = {
+            (name, labels): value for (name, labels), value in _counters.items()
+        }
+        latencies = {
+            (name, labels): {
+                'count': h.count,
+                'mean': h.sum / h.count if h.count else 0.0,
+                'max': h.max,
+                'total': h.sum,
+            }
+            for (name, labels), h in _histograms.items()
+        }
+    return {'counters': counters, 'latencies': latencies}
+
+
+def reset() -> None:
+    """Clear all collected metrics and profiler samples."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+    _profiler.clear()
+
+
+class SamplingProfiler:
+    """Periodically samples every thread's stack to find hot paths.
+
+    Sampling is opt-in and off by default; each sample costs one walk of
+    the live frames, so keep the interval at a few milliseconds or more.
+    """
+
+    def __init__(self) -> None:
+        self.interval = 0.0
+        self.samples = 0
+        self.leaves: Counter = Counter()
+        self.stacks: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float) -> None:
+        if self.running:
+            return
+        self.interval = interval
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self.samples = 0
+            self.leaves.clear()
+            self.stacks.clear()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                self.samples += 1
+                for thread_id, top in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    stack: List[str] = []
+                    frame: Optional[FrameType] = top
+                    while frame is not None and len(stack) < PROFILE_MAX_DEPTH:
+                        code = frame.f_code
+                        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                        frame = frame.f_back
+                    if stack:
+                        self.leaves[stack[0]] += 1
+                        self.stacks[";".join(reversed(stack))] += 1
+
+    def report(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get the most frequently sampled innermost frames."""
+        with self._lock:
+            return self.leaves.most_common(limit)
+
+    def collapsed_stacks(self) -> str:
+        """Get all sampled stacks in collapsed format, ready for flamegraph tools."""
+        with self._lock:
+            return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+_profiler = SamplingProfiler()
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get the process-wide sampling profiler."""
+    return _profiler
+
+
+def start_profiler_from_env() -> None:
+    """Start the sampling profiler if ``YT_MCP_PROFILE_INTERVAL`` is set."""
+    interval = os.environ.get(PROFILE_INTERVAL_ENV)
+    if interval:
+        _profiler.start(float(interval))
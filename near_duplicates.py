@@ -0,0 +1,209 @@
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import random
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from itertools import combinations
+
+import metrics
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# MinHash signature length
+NUM_PERMUTATIONS = 128
+
+# The LSH band split is chosen per threshold so that a pair exactly at the
+# threshold becomes a candidate with at least this probability
+LSH_RECALL = 0.99
+
+# Up to this many transcripts every pair is compared exactly, skipping LSH
+EXACT_MAX_SIGNATURES = 64
+
+# Matching shingles closer than this many seconds belong to the same time range
+MATCH_GAP = 15.0
+
+# Shortest run of shared shingles reported as a matching range
+MIN_MATCH_SHINGLES = 3
+
+# Number of transcript signatures kept in memory
+CACHE_SIZE = 1024
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+# Fixed seed so signatures stay comparable across processes and restarts
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+@dataclass
+class TranscriptSignature:
+    """MinHash signature of a transcript plus where each shingle occurs."""
+    video_id: str
+    segment_count: int
+    signature: Tuple[int, ...]
+    shingle_times: Dict[int, float]
+
+
+@dataclass
+class DuplicatePair:
+    """Two videos whose transcripts are near-duplicates."""
+    first: str
+    second: str
+    estimated_similarity: float
+    jaccard: float
+    # (first start, first end, second start, second end), in seconds
+    matching_ranges: List[Tuple[float, float, float, float]]
+
+
+_cache: "OrderedDict[str, TranscriptSignature]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def build_signature(video_id: str, transcript: List[Dict[str, Any]]) -> TranscriptSignature:
+    """Compute the MinHash signature of a transcript's word shingles.
+
+    CPU-bound and picklable, so it can run in a worker process.
+    """
+    words: List[Tuple[str, float]] = []
+    for segment in transcript:
+        for word in _WORD_RE.findall(segment['text'].lower()):
+            words.append((word, segment['start']))
+
+    shingle_times: Dict[int, float] = {}
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = " ".join(word for word, _ in words[i:i + SHINGLE_SIZE])
+        shingle_times.setdefault(_shingle_hash(shingle), words[i][1])
+
+    hashes = list(shingle_times)
+    if hashes:
+        signature = tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+        )
+    else:
+        signature = (_MAX_HASH,) * NUM_PERMUTATIONS
+    return TranscriptSignature(video_id, len(transcript), signature, shingle_times)
+
+
+def get_cached_signature(video_id: str, transcript: List[Dict[str, Any]]) -> Optional[TranscriptSignature]:
+    """Get the stored signature of a transcript, if it is still current."""
+    with _cache_lock:
+        signature = _cache.get(video_id)
+        if signature is not None and signature.segment_count == len(transcript):
+            _cache.move_to_end(video_id)
+            metrics.incr("cache_hits", cache="minhash")
+            return signature
+    metrics.incr("cache_misses", cache="minhash")
+    return None
+
+
+def cache_signature(signature: TranscriptSignature) -> None:
+    """Store a transcript signature for later comparisons."""
+    with _cache_lock:
+        _cache[signature.video_id] = signature
+        _cache.move_to_end(signature.video_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _matching_ranges(
+    first: TranscriptSignature,
+    second: TranscriptSignature,
+    shared: set
+) -> List[Tuple[float, float, float, float]]:
+    """Group shared shingles into runs of nearby timestamps in the first video."""
+    matches = sorted((first.shingle_times[h], second.shingle_times[h]) for h in shared)
+    runs: List[List[Tuple[float, float]]] = []
+    for match in matches:
+        if runs and match[0] - runs[-1][-1][0] <= MATCH_GAP:
+            runs[-1].append(match)
+        else:
+            runs.append([match])
+
+    ranges = []
+    for run in runs:
+        if len(run) < MIN_MATCH_SHINGLES:
+            continue
+        second_times = [time for _, time in run]
+        ranges.append((run[0][0], run[-1][0], min(second_times), max(second_times)))
+    return ranges
+
+
+def lsh_bands(threshold: float) -> Optional[Tuple[int, int]]:
+    """Choose (bands, rows per band) for LSH candidate selection at threshold.
+
+    More rows per band mean fewer false candidates, so this is the most rows
+    for which a pair at the threshold still becomes a candidate with
+    probability LSH_RECALL. None if no split gets there (very low thresholds).
+    """
+    for rows in range(NUM_PERMUTATIONS, 0, -1):
+        bands = NUM_PERMUTATIONS // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= LSH_RECALL:
+            return bands, rows
+    return None
+
+
+def _lsh_candidates(
+    signatures: List[TranscriptSignature],
+    indices: List[int],
+    bands: int,
+    rows: int
+) -> set[Tuple[int, int]]:
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    for index in indices:
+        for band in range(bands):
+            key = signatures[index].signature[band * rows:(band + 1) * rows]
+            buckets[(band, key)].append(index)
+
+    candidates: set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) > 1:
+            candidates.update(combinations(members, 2))
+    return candidates
+
+
+def find_near_duplicates(signatures: List[TranscriptSignature], threshold: float = 0.5) -> List[DuplicatePair]:
+    """Find pairs of transcripts with Jaccard similarity of at least threshold.
+
+    Small sets are compared pair by pair. For larger ones LSH banding, tuned
+    to the threshold, only compares pairs that agree on at least one band, so
+    the cost grows with the number of likely matches rather than all N^2 pairs.
+    """
+    indices = [index for index, signature in enumerate(signatures) if signature.shingle_times]
+    split = lsh_bands(threshold) if len(indices) > EXACT_MAX_SIGNATURES else None
+    if split is None:
+        candidates = set(combinations(indices, 2))
+    else:
+        candidates = _lsh_candidates(signatures, indices, *split)
+
+    pairs = []
+    for i, j in candidates:
+        first, second = signatures[i], signatures[j]
+        estimated = sum(
+            a == b for a, b in zip(first.signature, second.signature)
+        ) / NUM_PERMUTATIONS
+        shared = first.shingle_times.keys() & second.shingle_times.keys()
+        union = len(first.shingle_times) + len(second.shingle_times) - len(shared)
+        jaccard = len(shared) / union if union else 0.0
+        if jaccard >= threshold:
+            pairs.append(DuplicatePair(
+                first.video_id,
+                second.video_id,
+                estimated,
+                jaccard,
+                _matching_ranges(first, second, shared)
+            ))
+
+    pairs.sort(key=lambda pair: pair.jaccard, reverse=True)
+    return pairs
@@ -0,0 +1,192 @@
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import threading
+
+import metrics
+from youtube_api import get_related_videos
+
+# Where the related-video adjacency store is persisted
+GRAPH_PATH = os.environ.get("YT_MCP_GRAPH_PATH", "related_graph.json")
+
+# Maximum number of search.list calls in flight during a crawl
+CRAWL_CONCURRENCY = 4
+
+# Neighbors fetched and stored per video. search.list costs 100 units whatever
+# maxResults is, so every fetch takes the maximum and crawls of any breadth
+# can share the stored adjacency lists.
+NEIGHBORS_PER_FETCH = 25
+
+# PageRank parameters
+DAMPING = 0.85
+PAGERANK_ITERATIONS = 50
+PAGERANK_TOLERANCE = 1e-8
+
+
+class RelatedVideoGraph:
+    """Adjacency-list store of related-video edges, persisted as JSON.
+
+    A video whose neighbors are in the store is never fetched again, so every
+    crawl only pays for the part of the neighborhood it has not seen before.
+    """
+
+    def __init__(self, path: str = GRAPH_PATH) -> None:
+        self.path = path
+        self.adjacency: Dict[str, List[str]] = {}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        """Load the store from disk, starting empty if it does not exist."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self.adjacency = data.get("adjacency", {})
+            self.nodes = data.get("nodes", {})
+
+    def save(self) -> None:
+        """Write the store to disk atomically."""
+        # Held for the whole write so concurrent crawls cannot race on the temp file
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"adjacency": self.adjacency, "nodes": self.nodes}, f)
+            os.replace(tmp_path, self.path)
+
+    def has_edges(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self.adjacency
+
+    def neighbors(self, video_id: str) -> List[str]:
+        with self._lock:
+            return list(self.adjacency.get(video_id, []))
+
+    def add_edges(self, video_id: str, related: List[dict[str, Any]]) -> None:
+        """Record the related videos of a video, keeping their title and channel."""
+        with self._lock:
+            self.adjacency[video_id] = [video['id'] for video in related]
+            for video in related:
+                self.nodes[video['id']] = {
+                    'title': video.get('title', 'Unknown'),
+                    'channel_title': video.get('channel_title', 'Unknown'),
+                }
+
+    def edge_count(self) -> int:
+        with self._lock:
+            return sum(len(targets) for targets in self.adjacency.values())
+
+    def pagerank(self) -> Dict[str, float]:
+        """Compute PageRank over the whole stored graph."""
+        with self._lock:
+            adjacency = {source: list(targets) for source, targets in self.adjacency.items()}
+
+        nodes = set(adjacency)
+        for targets in adjacency.values():
+            nodes.update(targets)
+        if not nodes:
+            return {}
+
+        n = len(nodes)
+        rank = dict.fromkeys(nodes, 1.0 / n)
+        for _ in range(PAGERANK_ITERATIONS):
+            # Nodes without known outgoing edges spread their rank evenly
+            dangling = sum(rank[node] for node in nodes if not adjacency.get(node))
+            base = (1.0 - DAMPING) / n + DAMPING * dangling / n
+            new_rank = dict.fromkeys(nodes, base)
+            for source, targets in adjacency.items():
+                if targets:
+                    share = DAMPING * rank[source] / len(targets)
+                    for target in targets:
+                        new_rank[target] += share
+
+            delta = sum(abs(new_rank[node] - rank[node]) for node in nodes)
+            rank = new_rank
+            if delta < PAGERANK_TOLERANCE:
+                break
+        return rank
+
+    def in_degrees(self) -> Dict[str, int]:
+        with self._lock:
+            degrees: Dict[str, int] = {}
+            for targets in self.adjacency.values():
+                for target in targets:
+                    degrees[target] = degrees.get(target, 0) + 1
+        return degrees
+
+
+_graph: Optional[RelatedVideoGraph] = None
+_graph_lock = threading.Lock()
+
+
+def get_graph() -> RelatedVideoGraph:
+    """Get the process-wide related-video store, loading it on first use."""
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            _graph = RelatedVideoGraph()
+        return _graph
+
+
+async def crawl(
+    graph: RelatedVideoGraph,
+    video_id: str,
+    depth: int = 2,
+    breadth: int = 5,
+    max_fetches: int = 50
+) -> Tuple[List[str], int]:
+    """Breadth-first crawl of related videos starting at video_id.
+
+    Each level's unseen videos are fetched concurrently; videos already in the
+    store are expanded from it without any API call. Fetches always store
+    NEIGHBORS_PER_FETCH neighbors; breadth only limits how many are followed.
+
+    Args:
+        graph: Adjacency store to read from and extend
+        video_id: Video to start from
+        depth: Number of hops to follow
+        breadth: Number of related videos followed per video
+        max_fetches: Maximum number of search.list calls (100 quota units each)
+
+    Returns:
+        Visited video IDs in BFS order, and the number of API fetches made
+    """
+    semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+    visited = {video_id}
+    order = [video_id]
+    frontier = [video_id]
+    fetches = 0
+
+    async def fetch(source: str) -> None:
+        async with semaphore:
+            related = await asyncio.to_thread(get_related_videos, source, max_results=NEIGHBORS_PER_FETCH)
+        # An empty result may be a transient error, so it is not stored as "no neighbors"
+        if related:
+            graph.add_edges(source, related)
+
+    for _ in range(depth):
+        unseen = [source for source in frontier if not graph.has_edges(source)]
+        metrics.incr("cache_hits", len(frontier) - len(unseen), cache="related_graph")
+        # Videos beyond the fetch budget are neither hits nor misses, just not expanded
+        unseen = unseen[:max(0, max_fetches - fetches)]
+        metrics.incr("cache_misses", len(unseen), cache="related_graph")
+        if unseen:
+            await asyncio.gather(*(fetch(source) for source in unseen))
+            fetches += len(unseen)
+            await asyncio.to_thread(graph.save)
+
+        next_frontier = []
+        for source in frontier:
+            for target in graph.neighbors(source)[:breadth]:
+                if target not in visited:
+                    visited.add(target)
+                    order.append(target)
+                    next_frontier.append(target)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+
+    return order, fetches
@@ -0,0 +1,264 @@
+"""Record and replay upstream traffic.
+
+In record mode every Data API response, transcript fetch and search scrape
+is stored in a compact SQLite archive (zlib-compressed JSON, indexed by a
+hash of the request). Failed calls are stored too, so a Data API error is
+raised again as an equivalent HttpError and other failures as an exception
+of the same type. In replay mode those exchanges are served from the
+archive without touching the network, either with the latency measured
+when they were recorded or with none, which makes performance runs
+deterministic and separates the server's own overhead from the network.
+
+Configure with environment variables:
+    YT_MCP_REPLAY_MODE     off (default), record or replay
+    YT_MCP_REPLAY_ARCHIVE  archive path (default: upstream_replay.db)
+    YT_MCP_REPLAY_LATENCY  recorded (default) or zero
+
+Run ``python replay.py`` to list what an archive contains.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+import base64
+import hashlib
+import importlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+import metrics
+
+REPLAY_MODES = ("off", "record", "replay")
+REPLAY_LATENCIES = ("recorded", "zero")
+
+T = TypeVar("T")
+
+
+class ReplayMiss(LookupError):
+    """Raised in replay mode when no recorded exchange matches a request."""
+
+
+class RecordedError(Exception):
+    """Replays a recorded failure whose exception type cannot be rebuilt."""
+
+    def __init__(self, error_type: str, message: str) -> None:
+        super().__init__(f"{error_type}: {message}")
+        self.error_type = error_type
+
+
+class ReplayArchive:
+    """SQLite archive of upstream exchanges keyed by request hash."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS exchanges (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    request TEXT NOT NULL,
+                    latency REAL NOT NULL,
+                    response BLOB NOT NULL,
+                    recorded_at REAL NOT NULL,
+                    failed INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            # Archives recorded before failures were stored lack the column
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(exchanges)")}
+            if "failed" not in columns:
+                self._conn.execute("ALTER TABLE exchanges ADD COLUMN failed INTEGER NOT NULL DEFAULT 0")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, bool, Any]]:
+        """Get the recorded latency, whether the call failed, and its response or error."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT latency, failed, response FROM exchanges WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        latency, failed, response = row
+        return latency, bool(failed), json.loads(zlib.decompress(response))
+
+    def put(
+        self,
+        key: str,
+        kind: str,
+        request: Dict[str, Any],
+        latency: float,
+        response: Any,
+        failed: bool = False
+    ) -> None:
+        """Store an exchange, replacing any earlier recording of the same request.
+
+        For a failed call, response is the error description from _describe_error.
+        """
+        blob = zlib.compress(json.dumps(response, separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO exchanges "
+                "(key, kind, request, latency, response, recorded_at, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(request, sort_keys=True), latency, blob, time.time(), int(failed)),
+            )
+            self._conn.commit()
+
+    def summary(self) -> list[Tuple[str, int, int, float, int]]:
+        """Get (kind, exchanges, failed, mean latency, compressed bytes) per kind of exchange."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT kind, COUNT(*), SUM(failed), AVG(latency), SUM(LENGTH(response)) "
+                "FROM exchanges GROUP BY kind ORDER BY kind"
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_mode = os.environ.get("YT_MCP_REPLAY_MODE", "off")
+_archive_path = os.environ.get("YT_MCP_REPLAY_ARCHIVE", "upstream_replay.db")
+_latency = os.environ.get("YT_MCP_REPLAY_LATENCY", "recorded")
+_archive: Optional[ReplayArchive] = None
+_archive_lock = threading.Lock()
+
+
+def configure(mode: Optional[str] = None, archive_path: Optional[str] = None, latency: Optional[str] = None) -> None:
+    """Override the environment configuration, e.g. from a benchmark script."""
+    global _mode, _archive_path, _latency, _archive
+    if mode is not None and mode not in REPLAY_MODES:
+        raise ValueError(f"Unknown replay mode {mode!r}, expected one of {REPLAY_MODES}")
+    if latency is not None and latency not in REPLAY_LATENCIES:
+        raise ValueError(f"Unknown replay latency {latency!r}, expected one of {REPLAY_LATENCIES}")
+    with _archive_lock:
+        _mode = mode or _mode
+        _latency = latency or _latency
+        if archive_path is not None and archive_path != _archive_path:
+            _archive_path = archive_path
+            if _archive is not None:
+                _archive.close()
+                _archive = None
+
+
+def get_mode() -> str:
+    """Get the current mode: "off", "record" or "replay"."""
+    return _mode
+
+
+def _get_archive() -> ReplayArchive:
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ReplayArchive(_archive_path)
+        return _archive
+
+
+def _request_key(kind: str, request: Dict[str, Any]) -> str:
+    payload = json.dumps([kind, request], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _describe_error(error: Exception) -> Dict[str, Any]:
+    """Describe a failed call so _rebuild_error can raise an equivalent exception."""
+    error_type = type(error)
+    description: Dict[str, Any] = {
+        'type': f"{error_type.__module__}.{error_type.__qualname__}",
+        'message': str(error),
+    }
+    # googleapiclient's HttpError: keep the HTTP response so handlers see the same status
+    resp = getattr(error, 'resp', None)
+    content = getattr(error, 'content', None)
+    if resp is not None and isinstance(content, bytes):
+        description['http'] = {
+            'status': resp.status,
+            'reason': resp.reason,
+            'headers': dict(resp),
+            'content': base64.b64encode(content).decode("ascii"),
+            'uri': getattr(error, 'uri', None),
+        }
+    return description
+
+
+def _rebuild_error(description: Dict[str, Any]) -> Exception:
+    """Rebuild the exception a recorded call raised."""
+    http = description.get('http')
+    if http is not None:
+        import httplib2
+        from googleapiclient.errors import HttpError
+
+        resp = httplib2.Response(http['headers'])
+        resp.status = http['status']
+        resp.reason = http['reason']
+        return HttpError(resp, base64.b64decode(http['content']), uri=http['uri'])
+
+    module_name, _, name = description['type'].rpartition(".")
+    try:
+        error_type = getattr(importlib.import_module(module_name), name)
+        if isinstance(error_type, type) and issubclass(error_type, Exception):
+            return error_type(description['message'])
+    except Exception:
+        pass
+    return RecordedError(description['type'], description['message'])
+
+
+def exchange(kind: str, request: Dict[str, Any], fetch: Callable[[], T]) -> T:
+    """Perform an upstream call, recording or replaying it depending on the mode.
+
+    Args:
+        kind: Kind of upstream call, e.g. "data_api" or "transcript"
+        request: JSON-serializable description that identifies the request
+        fetch: Performs the real call; its result must be JSON-serializable
+
+    Raises:
+        ReplayMiss: In replay mode, when the request was never recorded
+        Exception: Whatever fetch raised, or in replay mode an equivalent of
+            what it raised while recording
+    """
+    if _mode == "off":
+        return fetch()
+
+    key = _request_key(kind, request)
+    if _mode == "replay":
+        found = _get_archive().get(key)
+        if found is None:
+            metrics.incr("replay_misses", kind=kind)
+            raise ReplayMiss(f"No recorded {kind} response for {request}")
+        latency, failed, response = found
+        metrics.incr("replay_hits", kind=kind)
+        if _latency == "recorded":
+            time.sleep(latency)
+        if failed:
+            raise _rebuild_error(response)
+        return response
+
+    start = time.perf_counter()
+    try:
+        response = fetch()
+    except Exception as e:
+        _get_archive().put(key, kind, request, time.perf_counter() - start, _describe_error(e), failed=True)
+        raise
+    _get_archive().put(key, kind, request, time.perf_counter() - start, response)
+    return response
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else _archive_path
+    if not os.path.exists(path):
+        sys.exit(f"No replay archive at {path}")
+    archive = ReplayArchive(path)
+    print(f"Replay archive: {path} ({os.path.getsize(path)} bytes on disk)")
+    for kind, count, failed, mean_latency, size in archive.summary():
+        print(
+            f"- {kind}: {count} exchanges ({failed} failed), mean latency {mean_latency * 1000:.1f} ms, "
+            f"{size} bytes compressed"
+        )
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
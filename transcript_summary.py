@@ -0,0 +1,226 @@
+from typing import Any, List, Dict, Tuple, Optional
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from itertools import chain
+from dataclasses import dataclass
+
+import metrics
+
+# Words that carry no topical weight and are dropped before scoring
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further get got had has have having he her here hers herself him himself
+his how i if in into is it its itself just know like me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own really right same she
+should so some such than that the their theirs them themselves then there these they
+this those through to too um uh under until up very was we well were what when where
+which while who whom why will with would yeah you your yours yourself yourselves
+going gonna okay oh actually thing things lot
+""".split())
+
+# Auto-generated captions are often unpunctuated, so long runs are split at this many words
+MAX_SENTENCE_WORDS = 40
+
+# Sentences shorter than this rarely make useful summary lines
+MIN_SENTENCE_WORDS = 6
+
+# Number of highest-weighted terms kept in the transcript centroid
+CENTROID_TERMS = 100
+
+# Candidates more similar than this to an already selected sentence are skipped
+REDUNDANCY_THRESHOLD = 0.6
+
+# Number of ranked transcripts kept in memory
+CACHE_SIZE = 256
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]*$")
+
+
+@dataclass(frozen=True)
+class KeySentence:
+    """A transcript sentence selected for the summary."""
+    start: float
+    text: str
+    score: float
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    start: float
+    text: str
+    score: float
+    counts: Counter
+    # Shared by every candidate of the same transcript
+    idf: Dict[str, float]
+
+    def vector(self) -> Dict[str, float]:
+        """Unit-length TF-IDF vector, only built for sentences that get compared."""
+        vector = {term: (1 + math.log(tf)) * self.idf[term] for term, tf in self.counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {term: weight / norm for term, weight in vector.items()}
+
+
+_cache: "OrderedDict[Any, List[_Candidate]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format a transcript offset as MM:SS, or H:MM:SS for long videos."""
+    total = int(seconds)
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+def split_sentences(transcript: List[Dict[str, Any]]) -> List[Tuple[float, str]]:
+    """Regroup transcript segments into sentences tagged with their start time."""
+    sentences = []
+    words: List[str] = []
+    start = 0.0
+
+    for segment in transcript:
+        for piece in _SENTENCE_SPLIT_RE.split(segment['text'].replace("\n", " ")):
+            piece_words = piece.split()
+            if not piece_words:
+                continue
+            if not words:
+                start = segment['start']
+            words.extend(piece_words)
+
+            if _SENTENCE_END_RE.search(piece) or len(words) >= MAX_SENTENCE_WORDS:
+                sentences.append((start, " ".join(words)))
+                words = []
+
+    if words:
+        sentences.append((start, " ".join(words)))
+    return sentences
+
+
+def _tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS and len(token) > 1]
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    # Vectors are unit length, so the dot product is the cosine similarity
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def _rank(transcript: List[Dict[str, Any]]) -> List[_Candidate]:
+    """Score every sentence against the transcript's TF-IDF centroid, best first."""
+    sentences = split_sentences(transcript)
+    term_counts = [Counter(_tokenize(text)) for _, text in sentences]
+
+    # Counting whole iterables at once is much faster than per-sentence updates
+    document_frequency = Counter(chain.from_iterable(term_counts))
+    corpus_frequency: Counter = Counter()
+    for counts in term_counts:
+        corpus_frequency.update(counts)
+
+    n = len(sentences)
+    idf = {term: math.log((1 + n) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+
+    # The centroid holds the terms that dominate the whole transcript
+    top_terms = sorted(corpus_frequency, key=lambda term: corpus_frequency[term] * idf[term], reverse=True)
+    centroid = {term: corpus_frequency[term] * idf[term] for term in top_terms[:CENTROID_TERMS]}
+    norm = math.sqrt(sum(weight * weight for weight in centroid.values())) or 1.0
+    centroid = {term: weight / norm for term, weight in centroid.items()}
+
+    candidates = []
+    for (start, text), counts in zip(sentences, term_counts):
+        if not counts or text.count(" ") + 1 < MIN_SENTENCE_WORDS:
+            continue
+        # Cosine with the centroid, without materializing the sentence vector
+        dot = 0.0
+        squares = 0.0
+        for term, tf in counts.items():
+            weight = (1 + math.log(tf)) * idf[term] if tf > 1 else idf[term]
+            squares += weight * weight
+            if term in centroid:
+                dot += weight * centroid[term]
+        candidates.append(_Candidate(start, text, dot / math.sqrt(squares), counts, idf))
+
+    candidates.sort(key=lambda candidate: candidate.score, reverse=True)
+    return candidates
+
+
+def _ranked_candidates(transcript: List[Dict[str, Any]], cache_key: Optional[Any]) -> List[_Candidate]:
+    if cache_key is None:
+        return _rank(transcript)
+
+    # Guard against a transcript that changed under the same key
+    key = (cache_key, len(transcript), transcript[-1]['start'] if transcript else 0)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            metrics.incr("cache_hits", cache="transcript_summary")
+            return _cache[key]
+
+    metrics.incr("cache_misses", cache="transcript_summary")
+    with metrics.timer("phase", phase="transcript_summary.rank"):
+        ranked = _rank(transcript)
+    with _cache_lock:
+        _cache[key] = ranked
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return ranked
+
+
+def summarize_transcript(
+    transcript: List[Dict[str, Any]],
+    max_sentences: int = 5,
+    max_chars: Optional[int] = None,
+    cache_key: Optional[Any] = None
+) -> List[KeySentence]:
+    """Pick the most representative sentences of a transcript.
+
+    Sentences are scored once per transcript by TF-IDF similarity to the
+    transcript centroid and the ranking is cached under ``cache_key``, so
+    asking for a different length budget later is cheap.
+
+    Args:
+        transcript: List of transcript segments with 'text' and 'start'
+        max_sentences: Maximum number of sentences to return (default: 5)
+        max_chars: Maximum total length of the returned sentences (default: no limit)
+        cache_key: Key to cache the ranking under, usually the video ID
+
+    Returns:
+        Selected sentences in chronological order; the opening sentences
+        if the transcript is too short to score
+    """
+    selected: List[_Candidate] = []
+    vectors: List[Dict[str, float]] = []
+    used_chars = 0
+
+    for candidate in _ranked_candidates(transcript, cache_key):
+        if len(selected) >= max_sentences:
+            break
+        if max_chars is not None and used_chars + len(candidate.text) > max_chars:
+            continue
+        vector = candidate.vector()
+        if any(_cosine(vector, other) > REDUNDANCY_THRESHOLD for other in vectors):
+            continue
+        selected.append(candidate)
+        vectors.append(vector)
+        used_chars += len(candidate.text)
+
+    if not selected and max_sentences > 0:
+        # Too short to score (no sentence of MIN_SENTENCE_WORDS), use the opening instead
+        opening = []
+        for start, text in split_sentences(transcript)[:max_sentences]:
+            if max_chars is not None and used_chars + len(text) > max_chars:
+                break
+            opening.append(KeySentence(start, text, 0.0))
+            used_chars += len(text)
+        return opening
+
+    selected.sort(key=lambda candidate: candidate.start)
+    return [KeySentence(candidate.start, candidate.text, candidate.score) for candidate in selected]
@@ -1,12 +1,18 @@
 from typing import Optional
+import asyncio
 
 import uvicorn
 from fastapi import FastAPI, Query
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
+import metrics
 from yt_helper import construct_video_url, search_youtube
 
 app = FastAPI(title="YouTube Video Search API")
 
+# Opt-in sampling profiler, see metrics.PROFILE_INTERVAL_ENV
+metrics.start_profiler_from_env()
+
 
 class Video(BaseModel):
     title: str
@@ -26,7 +32,9 @@ async def get_videos(
     ),
 ):
     """Search for YouTube videos."""
-    results = search_youtube(search, max_results=max_results)
+    with metrics.timer("endpoint", path="/videos"):
+        # Scraping and API paging block, so they run off the event loop
+        results = await asyncio.to_thread(search_youtube, search, max_results=max_results)
 
     formatted = [
         Video(
@@ -44,6 +52,12 @@ async def get_videos(
     return formatted
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose latency histograms and counters in Prometheus text format."""
+    return metrics.render_prometheus()
+
+
 def main():
     uvicorn.run("video_api:app", host="0.0.0.0", port=8000, reload=True)
 
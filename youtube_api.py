@@ -1,18 +1,62 @@
 from typing import Any, Optional, List
 import os
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
 import pickle
+import threading
+import time
+
+import metrics
+import replay
+
+# The Google client libraries, the transcript API and youtube_search are
+# imported on first use: they dominate import time, and MCP stdio servers are
+# started once per session, so cold start is user-visible latency.
 
 # If modifying these scopes, delete the file token.pickle.
 SCOPES = ['https://www.googleapis.com/auth/youtube.readonly']
 
-def get_authenticated_service():
-    """Get authenticated YouTube API service."""
+# Data API quota units charged per call; anything not listed costs 1 unit
+QUOTA_COSTS = {'search.list': 100}
+
+# Transient server errors worth retrying, and how often
+RETRY_STATUSES = {500, 502, 503, 504}
+MAX_RETRIES = 2
+RETRY_BACKOFF = 0.5
+
+
+class _ClientNotLoaded(Exception):
+    """Placeholder for HttpError until googleapiclient has been imported."""
+
+    # The HTTP response, as on HttpError
+    resp: Any
+
+
+# Rebound to googleapiclient.errors.HttpError by _load_client(). Nothing can
+# raise the real HttpError before that, so the placeholder never has to match.
+HttpError: type[_ClientNotLoaded] = _ClientNotLoaded
+
+# Credentials and the discovery document's JSON are shared process-wide.
+# Service objects are not thread-safe (httplib2), so each thread builds its
+# own once, from its own parse of the document.
+_credentials = None
+_client_loaded = False
+_discovery_document: Optional[str] = None
+_client_lock = threading.Lock()
+_thread_local = threading.local()
+
+def _load_client() -> None:
+    """Import googleapiclient and read the bundled YouTube discovery document once."""
+    global HttpError, _client_loaded, _discovery_document
+    from googleapiclient.discovery_cache import get_static_doc
+    from googleapiclient.errors import HttpError as _HttpError
+
+    HttpError = _HttpError
+    # google-api-python-client ships discovery documents with the package,
+    # so builds need not fetch or look it up again
+    _discovery_document = get_static_doc('youtube', 'v3')
+    _client_loaded = True
+
+def _load_credentials():
+    """Load, refresh or create the OAuth credentials."""
     creds = None
     # The file token.pickle stores the user's access and refresh tokens
     if os.path.exists('token.pickle'):
@@ -22,12 +66,14 @@ def get_authenticated_service():
     # If there are no (valid) credentials available, let the user log in.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
+            from google.auth.transport.requests import Request
             creds.refresh(Request())
         else:
             if not os.path.exists('credentials.json'):
                 raise FileNotFoundError(
                     "credentials.json not found. Please download it from Google Cloud Console"
                 )
+            from google_auth_oauthlib.flow import InstalledAppFlow
             flow = InstalledAppFlow.from_client_secrets_file(
                 'credentials.json', SCOPES)
             creds = flow.run_local_server(port=0)
@@ -35,7 +81,104 @@ def get_authenticated_service():
         with open('token.pickle', 'wb') as token:
             pickle.dump(creds, token)
 
-    return build('youtube', 'v3', credentials=creds)
+    return creds
+
+def _get_credentials():
+    """Get the shared credentials, reloading them only when they are no longer valid."""
+    global _credentials
+    if replay.get_mode() == "replay":
+        # Replayed requests never reach Google, so no login is needed
+        return None
+    with _client_lock:
+        if _credentials is None or not _credentials.valid:
+            with metrics.timer("upstream", call="auth"):
+                _credentials = _load_credentials()
+        return _credentials
+
+def credentials_available() -> bool:
+    """Check whether Data API calls can run without an interactive login.
+    
+    True in replay mode, or when stored credentials are valid or can be
+    refreshed. A credentials.json alone does not count: using it opens a
+    browser login.
+    """
+    if replay.get_mode() == "replay":
+        return True
+    creds = _credentials
+    if creds is None and os.path.exists('token.pickle'):
+        try:
+            with open('token.pickle', 'rb') as token:
+                creds = pickle.load(token)
+        except Exception:
+            return False
+    return creds is not None and (creds.valid or bool(creds.expired and creds.refresh_token))
+
+def execute_request(request, call: str) -> dict[str, Any]:
+    """Execute a Data API request, recording latency, quota and retries.
+    
+    In replay mode the response comes from the replay archive instead.
+    
+    Args:
+        request: Prepared googleapiclient request
+        call: API method name used as the metric label, e.g. "videos.list"
+    """
+    return replay.exchange(
+        "data_api",
+        {'method': request.method, 'uri': request.uri, 'body': request.body},
+        lambda: _execute_with_retries(request, call)
+    )
+
+def _execute_with_retries(request, call: str) -> dict[str, Any]:
+    for attempt in range(MAX_RETRIES + 1):
+        metrics.incr("quota_units", QUOTA_COSTS.get(call, 1), call=call)
+        try:
+            with metrics.timer("upstream", call=call):
+                return request.execute()
+        except HttpError as e:
+            if e.resp.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                raise
+            metrics.incr("retries", call=call)
+            time.sleep(RETRY_BACKOFF * 2 ** attempt)
+    # The last attempt either returns or re-raises
+    raise AssertionError("unreachable")
+
+def get_authenticated_service():
+    """Get authenticated YouTube API service.
+    
+    The service is built once per thread and reused; it is rebuilt only when
+    the shared credentials have to be reloaded.
+    """
+    creds = _get_credentials()
+    service = getattr(_thread_local, 'service', None)
+    if service is not None and _thread_local.credentials is creds:
+        return service
+
+    with _client_lock:
+        if not _client_loaded:
+            with metrics.timer("phase", phase="client_import"):
+                _load_client()
+
+    from googleapiclient.discovery import build, build_from_document
+
+    if creds is None:
+        # Replay mode: an unauthenticated transport stops the client from
+        # looking up default credentials, and keeps request URIs identical
+        # to the recorded ones
+        import httplib2
+        auth = {'http': httplib2.Http()}
+    else:
+        auth = {'credentials': creds}
+
+    with metrics.timer("phase", phase="service_build"):
+        if _discovery_document is not None:
+            # Parsed by each build, so no thread shares the client's mutable copy
+            service = build_from_document(_discovery_document, **auth)
+        else:
+            service = build('youtube', 'v3', **auth)
+
+    _thread_local.service = service
+    _thread_local.credentials = creds
+    return service
 
 def get_video_details(video_id: str) -> Optional[dict[str, Any]]:
     """Get detailed information about a video."""
@@ -45,7 +188,7 @@ def get_video_details(video_id: str) -> Optional[dict[str, Any]]:
             part="snippet,statistics,contentDetails",
             id=video_id
         )
-        response = request.execute()
+        response = execute_request(request, "videos.list")
         
         if not response['items']:
             return None
@@ -81,7 +224,7 @@ def get_channel_info(channel_id: str) -> Optional[dict[str, Any]]:
             part="snippet,statistics",
             id=channel_id
         )
-        response = request.execute()
+        response = execute_request(request, "channels.list")
         
         if not response['items']:
             return None
@@ -118,7 +261,7 @@ def get_video_comments(video_id: str, max_results: int = 100) -> list[dict[str,
         )
         
         while request and len(comments) < max_results:
-            response = request.execute()
+            response = execute_request(request, "commentThreads.list")
             
             for item in response['items']:
                 comment = item['snippet']['topLevelComment']['snippet']
@@ -150,7 +293,7 @@ def get_trending_videos(region_code: str = "US", max_results: int = 50) -> list[
             regionCode=region_code,
             maxResults=min(max_results, 50)
         )
-        response = request.execute()
+        response = execute_request(request, "videos.list")
         
         videos = []
         for item in response['items']:
@@ -183,7 +326,7 @@ def get_related_videos(video_id: str, max_results: int = 25) -> list[dict[str, A
             type="video",
             maxResults=min(max_results, 25)
         )
-        response = request.execute()
+        response = execute_request(request, "search.list")
         
         videos = []
         for item in response['items']:
@@ -203,6 +346,79 @@ def get_related_videos(video_id: str, max_results: int = 25) -> list[dict[str, A
         print(f"An HTTP error occurred: {e}")
         return []
 
+def search_videos(
+    query: str,
+    max_results: int = 50,
+    page_token: Optional[str] = None
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """Search for videos with the Data API, one results page per call.
+    
+    Args:
+        query: Search query string
+        max_results: Maximum number of results on this page (at most 50)
+        page_token: Continuation token from a previous call, or None for the first page
+        
+    Returns:
+        The videos on this page and the token for the next page (None when there is none)
+    """
+    try:
+        youtube = get_authenticated_service()
+        request = youtube.search().list(
+            part="snippet",
+            q=query,
+            type="video",
+            maxResults=min(max_results, 50),
+            pageToken=page_token
+        )
+        response = execute_request(request, "search.list")
+        
+        videos = []
+        for item in response['items']:
+            snippet = item['snippet']
+            videos.append({
+                'id': item['id']['videoId'],
+                'title': snippet['title'],
+                'channel_id': snippet['channelId'],
+                'channel_title': snippet['channelTitle'],
+                'published_at': snippet['publishedAt'],
+                'description': snippet['description'],
+                'thumbnails': snippet['thumbnails']
+            })
+        
+        return videos, response.get('nextPageToken')
+    except HttpError as e:
+        print(f"An HTTP error occurred: {e}")
+        return [], None
+
+def get_playlist_video_ids(playlist_id: str, max_results: int = 100) -> list[str]:
+    """Get the IDs of the videos in a playlist, in playlist order."""
+    try:
+        youtube = get_authenticated_service()
+        video_ids: list[str] = []
+        
+        request = youtube.playlistItems().list(
+            part="contentDetails",
+            playlistId=playlist_id,
+            maxResults=min(max_results, 50)
+        )
+        
+        while request and len(video_ids) < max_results:
+            response = execute_request(request, "playlistItems.list")
+            
+            for item in response['items']:
+                video_ids.append(item['contentDetails']['videoId'])
+                
+                if len(video_ids) >= max_results:
+                    break
+            
+            # Get the next page of playlist items
+            request = youtube.playlistItems().list_next(request, response)
+            
+        return video_ids
+    except HttpError as e:
+        print(f"An HTTP error occurred: {e}")
+        return []
+
 def get_video_transcript(video_id: str) -> Optional[List[dict[str, Any]]]:
     """Get the transcript for a video.
     
@@ -212,11 +428,19 @@ def get_video_transcript(video_id: str) -> Optional[List[dict[str, Any]]]:
     Returns:
         List of transcript segments with text and timing information, or None if transcript is not available
     """
+    def fetch() -> Optional[List[dict[str, Any]]]:
+        from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled, NoTranscriptFound
+
+        try:
+            with metrics.timer("upstream", call="transcript"):
+                return YouTubeTranscriptApi.get_transcript(video_id)
+        except (TranscriptsDisabled, NoTranscriptFound):
+            return None
+
     try:
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-        return transcript_list
-    except (TranscriptsDisabled, NoTranscriptFound):
-        return None
+        return replay.exchange("transcript", {'video_id': video_id}, fetch)
+    except replay.ReplayMiss:
+        raise
     except Exception as e:
         print(f"An error occurred while getting transcript: {e}")
         return None 
\ No newline at end of file
@@ -1,12 +1,184 @@
-from typing import Any
+from typing import Any, Iterable, Optional
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 
-from youtube_search import YoutubeSearch
+import metrics
+import replay
+from youtube_api import credentials_available, search_videos
 
+# How search_youtube chooses between scraping (free, first results page only)
+# and the Data API search.list (100 quota units per page of up to 50):
+#   "scrape":   never spend quota; large max_results get one page of results
+#   "fallback": scrape first, use the API when scraping fails or to page further
+#   "api":      always use the API
+# Spending quota is opt-in, so the default never needs credentials.
+SEARCH_POLICY = os.environ.get("YT_MCP_SEARCH_POLICY", "scrape")
 
-def search_youtube(query: str, max_results: int = 10) -> list[dict[str, Any]]:
-    """Search YouTube for a given query and return the results."""
-    results = YoutubeSearch(query, max_results=max_results).to_dict()
-    return results
+# Results requested from a scrape, a full first results page. The whole page
+# is always fetched and cached so a later, larger request can be served from it.
+SCRAPE_PAGE_SIZE = 20
+
+# Most API pages a single search may fetch, bounding quota per call
+MAX_API_PAGES = int(os.environ.get("YT_MCP_SEARCH_MAX_API_PAGES", "4"))
+
+# Seconds a cached search stays fresh, and how many queries are kept
+SEARCH_CACHE_TTL = float(os.environ.get("YT_MCP_SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_SIZE = 512
+
+SEARCH_POLICIES = ("scrape", "fallback", "api")
+
+
+class _SearchResults:
+    """Results fetched so far for one query, and where to continue from."""
+
+    def __init__(self) -> None:
+        self.fetched_at = time.monotonic()
+        self.videos: list[dict[str, Any]] = []
+        self.seen: set[str] = set()
+        self.page_token: Optional[str] = None
+        self.api_started = False
+        self.exhausted = False
+        # Held while fetching so concurrent identical searches fetch only once
+        self.lock = threading.Lock()
+
+    def extend(self, videos: Iterable[dict[str, Any]]) -> None:
+        for video in videos:
+            if video['id'] not in self.seen:
+                self.seen.add(video['id'])
+                self.videos.append(video)
+
+
+_cache: "OrderedDict[tuple[str, str], _SearchResults]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def _scrape(query: str) -> list[dict[str, Any]]:
+    # Imported lazily to keep server start-up fast
+    from youtube_search import YoutubeSearch
+
+    def fetch() -> list[dict[str, Any]]:
+        with metrics.timer("upstream", call="search_scrape"):
+            return YoutubeSearch(query, max_results=SCRAPE_PAGE_SIZE).to_dict()
+
+    return replay.exchange("search_scrape", {'query': query, 'max_results': SCRAPE_PAGE_SIZE}, fetch)
+
+
+def _from_api(video: dict[str, Any]) -> dict[str, Any]:
+    """Convert a Data API search result to the scraper's result format."""
+    return {
+        'id': video['id'],
+        'title': video['title'],
+        'channel': video['channel_title'],
+        'description': video['description'],
+        'publish_time': video['published_at'],
+        'thumbnails': [thumbnail['url'] for thumbnail in video['thumbnails'].values()],
+        'url_suffix': f"/watch?v={video['id']}",
+    }
+
+
+def _fetch_more(query: str, results: _SearchResults, max_results: int, policy: str) -> None:
+    """Extend results towards max_results according to the search policy."""
+    if policy != "api" and not results.videos and not results.api_started:
+        try:
+            scraped = _scrape(query)
+        except replay.ReplayMiss:
+            raise
+        except Exception as e:
+            print(f"An error occurred while scraping search results: {e}", file=sys.stderr)
+        else:
+            results.extend(scraped)
+            # A short page means there are no more results to page to
+            if len(scraped) < SCRAPE_PAGE_SIZE:
+                results.exhausted = True
+        if policy == "scrape":
+            # A scrape returns one results page, there is nothing to continue from
+            results.exhausted = True
+            return
+        if len(results.videos) >= max_results or results.exhausted:
+            return
+
+    if policy == "fallback":
+        if not credentials_available():
+            print("No Data API credentials, returning scraped search results only", file=sys.stderr)
+            return
+        metrics.incr("search_fallbacks", reason="paging" if results.videos else "scrape_failed")
+        try:
+            _page_api(query, results, max_results)
+        except replay.ReplayMiss:
+            raise
+        except Exception as e:
+            print(f"An error occurred while paging search results: {e}", file=sys.stderr)
+        return
+
+    _page_api(query, results, max_results)
+
+
+def _page_api(query: str, results: _SearchResults, max_results: int) -> None:
+    """Page through search.list, skipping videos the results already hold.
+
+    API paging starts at its own first page, not after the scraped page, and
+    continues from the stored page token on later calls.
+    """
+    pages = 0
+    while len(results.videos) < max_results and not results.exhausted and pages < MAX_API_PAGES:
+        if results.api_started and results.page_token is None:
+            results.exhausted = True
+            break
+        videos, results.page_token = search_videos(query, 50, page_token=results.page_token)
+        results.api_started = True
+        results.extend(_from_api(video) for video in videos)
+        pages += 1
+        if not videos:
+            results.exhausted = True
+
+
+def search_youtube(query: str, max_results: int = 10, policy: Optional[str] = None) -> list[dict[str, Any]]:
+    """Search YouTube for a given query and return the results.
+
+    Results are cached per normalized query. A later call asking for more
+    results is served from the cached results first; only the missing part is
+    fetched, from the stored API page token once API paging has started.
+
+    Args:
+        query: Search query string
+        max_results: Maximum number of results to return
+        policy: "scrape", "fallback" or "api" (default: SEARCH_POLICY)
+    """
+    policy = policy or SEARCH_POLICY
+    if policy not in SEARCH_POLICIES:
+        raise ValueError(f"Unknown search policy {policy!r}, expected one of {SEARCH_POLICIES}")
+
+    key = (normalize_query(query), policy)
+    with _cache_lock:
+        results = _cache.get(key)
+        if results is None or time.monotonic() - results.fetched_at > SEARCH_CACHE_TTL:
+            results = _cache[key] = _SearchResults()
+        _cache.move_to_end(key)
+        while len(_cache) > SEARCH_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    with results.lock:
+        if len(results.videos) >= max_results or results.exhausted:
+            metrics.incr("cache_hits", cache="search")
+            return results.videos[:max_results]
+
+        metrics.incr("cache_misses", cache="search")
+        _fetch_more(query, results, max_results, policy)
+
+        if not results.videos:
+            # Failed searches are not cached so the next call tries again
+            with _cache_lock:
+                if _cache.get(key) is results:
+                    del _cache[key]
+        return results.videos[:max_results]
 
 
 def construct_video_url(video_id: str) -> str: